@@ -0,0 +1,26 @@
+"""
+Pattern metadata for generate_diagram.py.
+
+Kept separate from the template bodies so that listing and selecting
+patterns never loads the templates themselves.
+"""
+
+import sys
+from types import MappingProxyType
+
+# Pattern key -> one-line description (display order)
+_DESCRIPTIONS = {
+    "api-led": "API-Led Connectivity (3-tier: Experience, Process, System)",
+    "hybrid": "Hybrid Integration (On-premises to Azure)",
+    "event-driven": "Event-Driven Architecture (Pub/Sub with multiple handlers)",
+    "microservices": "Microservices with Service Bus (Domain-driven design)",
+    "b2b-edi": "B2B/EDI Integration (Trading partners with Integration Accounts)",
+    "data-pipeline": "Data Pipeline (ETL/ELT with Data Factory and Synapse)",
+    "secure-private": "Secure Architecture (Private Endpoints and VNet Integration)",
+    "multi-region": "Multi-Region HA (Geo-redundant with Front Door)",
+    "iot-streaming": "IoT & Streaming (Real-time data ingestion and processing)",
+}
+
+# Read-only view with interned keys, so lookups with an interned key
+# short-circuit on identity
+DESCRIPTIONS = MappingProxyType({sys.intern(k): v for k, v in _DESCRIPTIONS.items()})
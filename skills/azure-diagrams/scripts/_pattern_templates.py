@@ -0,0 +1,341 @@
+"""
+Pattern template bodies for generate_diagram.py.
+
+Loaded lazily on the first diagram generation. Templates are plain Python:
+the sanitized diagram title and output filename are read from the NAME and
+OUTPUT globals at execution time, and the shared graph attributes from
+GRAPH_ATTR, so each template is compiled only once.
+"""
+
+import sys
+from types import MappingProxyType
+
+# Pattern key -> diagram code template
+_TEMPLATES = {
+    "api-led": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import APIManagement, LogicApps, ServiceBus
+from diagrams.azure.compute import FunctionApps
+from diagrams.azure.database import CosmosDb, SQL
+from diagrams.azure.storage import BlobStorage
+from diagrams.azure.security import KeyVaults
+from diagrams.onprem.client import Users
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="LR", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+    users = Users("API Consumers")
+
+    with Cluster("Experience Layer"):
+        apim = APIManagement("API Management")
+
+    with Cluster("Process Layer"):
+        logic = LogicApps("Orchestration")
+        func = FunctionApps("Transformation")
+
+    with Cluster("System Layer"):
+        bus = ServiceBus("Service Bus")
+
+    with Cluster("Data Layer"):
+        cosmos = CosmosDb("Cosmos DB")
+        sql = SQL("Azure SQL")
+        blob = BlobStorage("Blob Storage")
+
+    kv = KeyVaults("Key Vault")
+
+    users >> apim >> logic >> bus >> func
+    func >> [cosmos, sql, blob]
+    logic >> Edge(style="dashed") >> kv
+''',
+
+    "hybrid": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import LogicApps, ServiceBus, DataFactories
+from diagrams.azure.networking import OnPremisesDataGateways
+from diagrams.azure.storage import DataLakeStorage, BlobStorage
+from diagrams.azure.database import CosmosDb
+from diagrams.azure.security import KeyVaults
+from diagrams.onprem.database import MSSQL
+from diagrams.onprem.compute import Server
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="LR", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    with Cluster("On-Premises"):
+        erp = Server("ERP System")
+        sql = MSSQL("SQL Server")
+        files = Server("File Server")
+
+    gateway = OnPremisesDataGateways("Data Gateway")
+
+    with Cluster("Azure Integration"):
+        logic = LogicApps("Logic Apps")
+        adf = DataFactories("Data Factory")
+        bus = ServiceBus("Service Bus")
+
+    with Cluster("Azure Data"):
+        cosmos = CosmosDb("Cosmos DB")
+        lake = DataLakeStorage("Data Lake")
+        blob = BlobStorage("Blob Storage")
+
+    kv = KeyVaults("Key Vault")
+
+    [erp, sql] >> gateway >> logic >> bus
+    files >> gateway >> adf >> lake
+    logic >> cosmos
+    adf >> blob
+    logic >> Edge(style="dashed") >> kv
+''',
+
+    "event-driven": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import ServiceBus, EventGridTopics, LogicApps
+from diagrams.azure.compute import FunctionApps, AppServices
+from diagrams.azure.database import CosmosDb
+from diagrams.azure.storage import BlobStorage
+from diagrams.azure.monitor import ApplicationInsights
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="TB", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    with Cluster("Event Producers"):
+        app1 = AppServices("Order Service")
+        app2 = AppServices("Inventory Service")
+
+    with Cluster("Event Routing"):
+        bus = ServiceBus("Service Bus Topics")
+        grid = EventGridTopics("Event Grid")
+
+    with Cluster("Event Handlers"):
+        func1 = FunctionApps("Notifier")
+        func2 = FunctionApps("Analytics")
+        logic = LogicApps("Fulfillment")
+        func3 = FunctionApps("Audit")
+
+    with Cluster("Data"):
+        cosmos = CosmosDb("Event Store")
+        blob = BlobStorage("Archive")
+
+    insights = ApplicationInsights("Monitoring")
+
+    [app1, app2] >> bus >> [func1, func2, logic]
+    app1 >> grid >> func3
+    [func1, logic] >> cosmos
+    func3 >> blob
+    func2 >> Edge(style="dotted") >> insights
+''',
+
+    "microservices": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import APIManagement, ServiceBus
+from diagrams.azure.compute import ContainerApps, FunctionApps
+from diagrams.azure.database import CosmosDb, SQL, CacheForRedis
+from diagrams.azure.monitor import ApplicationInsights
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="TB", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    apim = APIManagement("API Gateway")
+
+    with Cluster("Microservices"):
+        with Cluster("Order Domain"):
+            order_svc = ContainerApps("Order Service")
+            order_db = CosmosDb("Orders")
+
+        with Cluster("Product Domain"):
+            product_svc = ContainerApps("Product Service")
+            product_db = SQL("Products")
+
+        with Cluster("Notification Domain"):
+            notif_svc = FunctionApps("Notification Service")
+
+    bus = ServiceBus("Event Bus")
+    cache = CacheForRedis("Cache")
+    insights = ApplicationInsights("App Insights")
+
+    apim >> [order_svc, product_svc]
+    order_svc >> order_db
+    product_svc >> product_db
+    order_svc >> bus >> [product_svc, notif_svc]
+    [order_svc, product_svc] >> cache
+    [order_svc, product_svc, notif_svc] >> Edge(style="dotted") >> insights
+''',
+
+    "b2b-edi": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import APIManagement, LogicApps, IntegrationAccounts, ServiceBus
+from diagrams.azure.storage import BlobStorage
+from diagrams.azure.security import KeyVaults
+from diagrams.onprem.client import Client
+from diagrams.onprem.compute import Server
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="LR", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    with Cluster("Trading Partners"):
+        partner1 = Client("Supplier A")
+        partner2 = Client("Supplier B")
+        partner3 = Client("Customer")
+
+    apim = APIManagement("AS2/SFTP Gateway")
+
+    with Cluster("B2B Processing"):
+        ia = IntegrationAccounts("Integration Account\\n(Maps, Schemas, Certs)")
+        logic = LogicApps("EDI Processing")
+        bus = ServiceBus("Message Queue")
+
+    with Cluster("Backend"):
+        erp = Server("ERP System")
+        archive = BlobStorage("EDI Archive")
+
+    kv = KeyVaults("Certificates & Keys")
+
+    [partner1, partner2, partner3] >> apim >> logic
+    logic - Edge(style="dashed") - ia
+    logic >> bus >> erp
+    logic >> archive
+    ia >> Edge(style="dashed") >> kv
+''',
+
+    "data-pipeline": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import DataFactories
+from diagrams.azure.analytics import AzureDatabricks, AzureSynapseAnalytics
+from diagrams.azure.storage import DataLakeStorage, BlobStorage
+from diagrams.azure.database import SQL
+from diagrams.onprem.database import MSSQL, Oracle
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="LR", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    with Cluster("Data Sources"):
+        sql_src = MSSQL("On-Prem SQL")
+        oracle = Oracle("Oracle")
+        blob_src = BlobStorage("File Drops")
+
+    with Cluster("Ingestion"):
+        adf = DataFactories("Data Factory")
+
+    with Cluster("Data Lake"):
+        raw = DataLakeStorage("Raw Zone")
+        curated = DataLakeStorage("Curated Zone")
+
+    with Cluster("Transform"):
+        databricks = AzureDatabricks("Databricks")
+
+    with Cluster("Serve"):
+        synapse = AzureSynapseAnalytics("Synapse Analytics")
+        sql_dw = SQL("Azure SQL DW")
+
+    [sql_src, oracle, blob_src] >> adf >> raw
+    raw >> databricks >> curated
+    curated >> [synapse, sql_dw]
+''',
+
+    "secure-private": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import APIManagement, LogicApps, ServiceBus
+from diagrams.azure.compute import FunctionApps
+from diagrams.azure.networking import ApplicationGateways, VirtualNetworks
+from diagrams.azure.database import SQL, CosmosDb
+from diagrams.azure.storage import BlobStorage
+from diagrams.azure.security import KeyVaults
+from diagrams.onprem.client import Users
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="TB", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    users = Users("Users")
+    appgw = ApplicationGateways("App Gateway + WAF")
+
+    with Cluster("Virtual Network"):
+        with Cluster("Integration Subnet"):
+            apim = APIManagement("APIM (Internal)")
+            logic = LogicApps("Logic Apps")
+            func = FunctionApps("Functions")
+
+        with Cluster("Data Subnet (Private Endpoints)"):
+            sql = SQL("Azure SQL")
+            cosmos = CosmosDb("Cosmos DB")
+            blob = BlobStorage("Storage")
+            bus = ServiceBus("Service Bus")
+            kv = KeyVaults("Key Vault")
+
+    users >> appgw >> apim >> [logic, func]
+    logic >> bus
+    logic >> [sql, cosmos, blob]
+    func >> [sql, cosmos]
+    logic >> Edge(style="dashed") >> kv
+    func >> Edge(style="dashed") >> kv
+''',
+
+    "multi-region": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.integration import APIManagement, LogicApps, ServiceBus
+from diagrams.azure.networking import FrontDoorAndCDNProfiles
+from diagrams.azure.database import CosmosDb, SQL
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="TB", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    frontdoor = FrontDoorAndCDNProfiles("Azure Front Door")
+
+    with Cluster("UK South (Primary)"):
+        apim1 = APIManagement("APIM")
+        logic1 = LogicApps("Logic Apps")
+        bus1 = ServiceBus("Service Bus")
+        sql1 = SQL("SQL Primary")
+
+    with Cluster("UK West (DR)"):
+        apim2 = APIManagement("APIM")
+        logic2 = LogicApps("Logic Apps")
+        bus2 = ServiceBus("Service Bus")
+        sql2 = SQL("SQL Secondary")
+
+    cosmos = CosmosDb("Cosmos DB\\n(Multi-Region)")
+
+    frontdoor >> [apim1, apim2]
+    apim1 >> logic1 >> bus1
+    apim2 >> logic2 >> bus2
+    logic1 >> cosmos
+    logic2 >> cosmos
+    sql1 - Edge(style="dashed", label="Geo-Rep") - sql2
+''',
+
+    "iot-streaming": '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.azure.iot import IotHub, IotEdge
+from diagrams.azure.analytics import EventHubs, StreamAnalyticsJobs
+from diagrams.azure.compute import FunctionApps
+from diagrams.azure.database import CosmosDb
+from diagrams.azure.storage import DataLakeStorage
+from diagrams.azure.ml import MachineLearningServiceWorkspaces
+
+with Diagram(NAME, show=False, filename=OUTPUT, direction="LR", outformat="svg",
+             graph_attr=GRAPH_ATTR):
+
+    with Cluster("Edge"):
+        edge = IotEdge("IoT Edge")
+
+    with Cluster("Ingestion"):
+        iot = IotHub("IoT Hub")
+        eh = EventHubs("Event Hubs")
+
+    with Cluster("Processing"):
+        asa = StreamAnalyticsJobs("Stream Analytics")
+        func = FunctionApps("Alerting")
+
+    with Cluster("Storage"):
+        cosmos = CosmosDb("Hot Store")
+        lake = DataLakeStorage("Cold Store")
+
+    ml = MachineLearningServiceWorkspaces("ML Workspace")
+
+    edge >> iot >> asa
+    asa >> [cosmos, lake, func]
+    eh >> asa
+    lake >> ml
+''',
+}
+
+# Read-only view with interned keys (matching _pattern_meta.DESCRIPTIONS)
+TEMPLATES = MappingProxyType({sys.intern(k): v for k, v in _TEMPLATES.items()})
@@ -6,15 +6,25 @@ Interactive script for quickly generating professional diagrams.
 Usage:
     python generate_diagram.py --name "Customer Integration" --pattern api-led --output customer-arch
     python generate_diagram.py --interactive
+    python generate_diagram.py --all
 """
 
 import argparse
 import ast
+import atexit
+import builtins
+import os
 import re
+import signal
 import subprocess
 import sys
-import tempfile
-from pathlib import Path
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path, PurePath
+from types import MappingProxyType
+
+from _pattern_meta import DESCRIPTIONS
 
 # =============================================================================
 # SECURITY CONFIGURATION
@@ -113,28 +123,31 @@ ALLOWED_IMPORTS = {
     "pathlib",   # Path handling for output files
 }
 
+# Immutable snapshot of the whitelist used for per-component prefix lookups
+_ALLOWED_PREFIXES = frozenset(ALLOWED_IMPORTS)
+
 # Blocked dangerous builtins
-BLOCKED_BUILTINS = {
+BLOCKED_BUILTINS = frozenset({
     "exec", "eval", "compile", "open", "__import__",
     "globals", "locals", "vars", "dir",
     "getattr", "setattr", "delattr", "hasattr",
     "breakpoint", "input", "help",
-}
+})
 
 # Blocked dangerous attribute access patterns
-BLOCKED_ATTRIBUTES = {
+BLOCKED_ATTRIBUTES = frozenset({
     "__class__", "__bases__", "__subclasses__", "__globals__",
     "__code__", "__builtins__", "__import__", "__loader__",
     "__spec__", "__dict__", "__mro__", "__init_subclass__",
-}
+})
 
 # Explicitly blocked imports (even if partial match)
-BLOCKED_IMPORTS = {
+BLOCKED_IMPORTS = frozenset({
     "os", "sys", "subprocess", "socket", "urllib", "requests",
     "http", "pickle", "shelve", "ctypes", "importlib",
     "shutil", "glob", "fnmatch", "io", "builtins",
     "code", "codeop", "marshal", "types",
-}
+})
 
 # Allowed output directories
 ALLOWED_OUTPUT_DIRS = {
@@ -144,9 +157,49 @@ ALLOWED_OUTPUT_DIRS = {
     "~/outputs",
 }
 
+# Allowed output directories, resolved once (resolve() hits the filesystem).
+# "." is left out: it would pin the import-time cwd, and the current
+# directory is checked per call instead.
+_RESOLVED_ALLOWED = tuple(Path(p).expanduser().resolve()
+                          for p in ALLOWED_OUTPUT_DIRS if p != ".")
+
 # Execution timeout in seconds
 EXECUTION_TIMEOUT = 60
 
+# Minimal environment passed to diagram subprocesses (built once)
+_CHILD_ENV = {
+    key: os.environ.get(key, '')
+    for key in ('PATH', 'PYTHONPATH', 'HOME', 'TEMP', 'TMP', 'USERPROFILE')
+}
+
+# Graph attributes shared by every pattern template (read as GRAPH_ATTR)
+_GRAPH_ATTR = {"fontsize": "20", "bgcolor": "white", "pad": "0.5"}
+
+# Content-addressed cache of rendered pattern SVGs
+SVG_CACHE_DIR = Path.home() / ".cache" / "azure-diagrams"
+SVG_CACHE_SIZE = 128
+# Bump when rendering changes in a way that invalidates cached SVGs
+SVG_CACHE_VERSION = "1"
+
+# Builtins available to pattern templates executed in-process
+SAFE_BUILTINS = ("range", "len", "list", "dict", "tuple", "str", "int", "float", "print")
+
+# Modules the persistent worker imports before accepting code
+WORKER_PRELOAD = ("diagrams", "graphviz", "matplotlib", "svgwrite")
+
+# The persistent worker forks a child per request, so it is POSIX-only
+_HAS_FORK = hasattr(os, "fork")
+
+# Characters stripped from user input by the sanitizers
+_NAME_RE = re.compile(r'[^a-zA-Z0-9\s\-_.,!?()\'"]')
+_OUTPUT_RE = re.compile(r'[/\\:*?"<>|]')
+
+# Image extension stripped from interactively entered output names
+_EXT_RE = re.compile(r'\.(svg|png)$')
+
+# Number of validation verdicts kept in memory (keyed by code digest)
+VALIDATION_CACHE_SIZE = 256
+
 
 # =============================================================================
 # SECURITY VALIDATION
@@ -157,7 +210,7 @@ class CodeValidationError(Exception):
     pass
 
 
-class CodeValidator(ast.NodeVisitor):
+class CodeValidator:
     """AST-based code validator that checks for security violations."""
 
     def __init__(self):
@@ -169,14 +222,12 @@ class CodeValidator(ast.NodeVisitor):
             module_name = alias.name
             if not self._is_allowed_import(module_name):
                 self.errors.append(f"Blocked import: '{module_name}'")
-        self.generic_visit(node)
 
     def visit_ImportFrom(self, node):
         """Check from ... import statements."""
         if node.module:
             if not self._is_allowed_import(node.module):
                 self.errors.append(f"Blocked import: '{node.module}'")
-        self.generic_visit(node)
 
     def visit_Call(self, node):
         """Check function calls for blocked builtins."""
@@ -187,63 +238,96 @@ class CodeValidator(ast.NodeVisitor):
             # Check for dangerous method calls
             if node.func.attr in BLOCKED_BUILTINS:
                 self.errors.append(f"Blocked builtin call: '{node.func.attr}()'")
-        self.generic_visit(node)
 
     def visit_Attribute(self, node):
         """Check attribute access for dangerous patterns."""
         if node.attr in BLOCKED_ATTRIBUTES:
             self.errors.append(f"Blocked attribute access: '{node.attr}'")
-        self.generic_visit(node)
 
-    def visit_Name(self, node):
-        """Check for direct access to blocked names."""
-        if node.id in BLOCKED_BUILTINS:
-            # Only flag if used as a call (handled in visit_Call)
-            pass
-        self.generic_visit(node)
-
-    def _is_allowed_import(self, module_name):
+    @staticmethod
+    def _is_allowed_import(module_name):
         """Check if a module import is allowed."""
+        parts = module_name.split('.')
+
         # Check if it's explicitly blocked
-        base_module = module_name.split('.')[0]
-        if base_module in BLOCKED_IMPORTS:
+        if parts[0] in BLOCKED_IMPORTS:
             return False
 
-        # Check if it matches allowed imports
-        if module_name in ALLOWED_IMPORTS:
-            return True
-
-        # Check if it's a submodule of an allowed import
-        for allowed in ALLOWED_IMPORTS:
-            if module_name.startswith(allowed + "."):
-                return True
-
-        return False
+        # Allowed if the module or any of its parent packages is whitelisted
+        return any('.'.join(parts[:i]) in _ALLOWED_PREFIXES
+                   for i in range(1, len(parts) + 1))
 
     def validate(self, code):
         """Validate code and return list of errors."""
         self.errors = []
         try:
-            tree = ast.parse(code)
-            self.visit(tree)
+            # Iterative pre-order walk that skips leaf nodes; children are
+            # pushed reversed so errors come out in source order
+            stack = [ast.parse(code)]
+            while stack:
+                node = stack.pop()
+                handler = _HANDLERS.get(type(node))
+                if handler is not None:
+                    handler(self, node)
+                stack.extend(reversed([child for child in ast.iter_child_nodes(node)
+                                       if type(child) not in _LEAF_NODES]))
         except SyntaxError as e:
             self.errors.append(f"Syntax error: {e}")
         return self.errors
 
 
+# Node type -> check, applied to every node reached by the walk
+_HANDLERS = {
+    ast.Import: CodeValidator.visit_Import,
+    ast.ImportFrom: CodeValidator.visit_ImportFrom,
+    ast.Call: CodeValidator.visit_Call,
+    ast.Attribute: CodeValidator.visit_Attribute,
+}
+
+# Nodes with no children that could hold a checked construct (a Name's only
+# child is its load/store context)
+_LEAF_NODES = frozenset({ast.Name, ast.Constant, ast.Load, ast.Store, ast.Del, ast.alias})
+
+
+# Validation verdicts keyed by SHA-256 digest of the code, oldest first.
+# Guarded by a lock: validate_code may be called from several threads.
+_VALIDATION_CACHE = OrderedDict()
+_VALIDATION_CACHE_LOCK = threading.Lock()
+
+
 def validate_code(code):
     """
     Validate code for security issues.
 
+    Verdicts are memoized by a SHA-256 digest of the code, so validating the
+    same snippet again (e.g. regenerating a pattern) skips parsing entirely.
+
     Args:
         code: Python code string to validate
 
     Returns:
         tuple: (is_valid, errors)
     """
+    import hashlib
+
+    digest = hashlib.sha256(code.encode()).digest()
+    with _VALIDATION_CACHE_LOCK:
+        cached = _VALIDATION_CACHE.get(digest)
+        if cached is not None:
+            _VALIDATION_CACHE.move_to_end(digest)
+    if cached is not None:
+        is_valid, errors = cached
+        return is_valid, list(errors)
+
     validator = CodeValidator()
     errors = validator.validate(code)
-    return len(errors) == 0, errors
+    is_valid = len(errors) == 0
+
+    with _VALIDATION_CACHE_LOCK:
+        _VALIDATION_CACHE[digest] = (is_valid, tuple(errors))
+        if len(_VALIDATION_CACHE) > VALIDATION_CACHE_SIZE:
+            _VALIDATION_CACHE.popitem(last=False)
+    return is_valid, errors
 
 
 def sanitize_name(name):
@@ -258,7 +342,7 @@ def sanitize_name(name):
         Sanitized name string
     """
     # Allow only safe characters
-    sanitized = re.sub(r'[^a-zA-Z0-9\s\-_.,!?()\'"]', '', name)
+    sanitized = _NAME_RE.sub('', name)
     # Limit length
     return sanitized[:200]
 
@@ -274,7 +358,7 @@ def sanitize_output(output):
         Sanitized filename string
     """
     # Remove any path separators and dangerous characters
-    sanitized = re.sub(r'[/\\:*?"<>|]', '', output)
+    sanitized = _OUTPUT_RE.sub('', output)
     # Remove any path traversal attempts
     sanitized = sanitized.replace('..', '')
     # Limit length
@@ -285,6 +369,27 @@ def validate_output_path(output_path):
     """
     Validate that output path is in an allowed directory.
 
+    A single relative path component (all that sanitize_output can produce)
+    is written to the current directory, which is checked lexically without
+    touching the filesystem. Anything else is resolved by
+    _validate_raw_output_path.
+
+    Args:
+        output_path: Path to validate
+
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    pure = PurePath(output_path)
+    if not pure.anchor and len(pure.parts) <= 1 and pure.name != '..':
+        return True, None
+    return _validate_raw_output_path(output_path)
+
+
+def _validate_raw_output_path(output_path):
+    """
+    Validate an unsanitized output path by resolving it (follows symlinks).
+
     Args:
         output_path: Path to validate
 
@@ -294,8 +399,7 @@ def validate_output_path(output_path):
     path = Path(output_path).resolve()
 
     # Check against allowed directories
-    for allowed in ALLOWED_OUTPUT_DIRS:
-        allowed_path = Path(allowed).expanduser().resolve()
+    for allowed_path in _RESOLVED_ALLOWED:
         try:
             path.relative_to(allowed_path)
             return True, None
@@ -312,21 +416,246 @@ def validate_output_path(output_path):
     return False, f"Output path not allowed. Allowed directories: {', '.join(ALLOWED_OUTPUT_DIRS)}"
 
 
-def execute_diagram_code(code, timeout=EXECUTION_TIMEOUT):
+def _install_direct_svg_render():
     """
-    Execute validated diagram code in an isolated subprocess.
+    Make diagrams.Diagram pipe SVG output straight into the target file.
 
-    Args:
-        code: Validated Python code to execute
-        timeout: Maximum execution time in seconds
+    The stock Diagram.__exit__ writes the DOT source to disk, renders it with
+    dot and then deletes the source. For SVG diagrams that are not opened in
+    a viewer, the source is piped to dot instead, skipping the intermediate
+    file. Other diagrams keep the original behaviour, as does everything if
+    diagrams cannot be imported.
 
-    Returns:
-        tuple: (success, output_or_error)
+    This patches diagrams.Diagram for the whole process, so after the first
+    template runs in-process any other Diagram used here is affected too.
     """
-    # First validate the code
-    is_valid, errors = validate_code(code)
-    if not is_valid:
-        return False, f"Code validation failed:\n" + "\n".join(f"  - {e}" for e in errors)
+    try:
+        import diagrams
+    except ImportError:
+        return
+
+    original_exit = diagrams.Diagram.__exit__
+    if getattr(original_exit, "_direct_svg", False):
+        return
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if getattr(self, "outformat", None) != "svg" or getattr(self, "show", True):
+            return original_exit(self, exc_type, exc_value, traceback)
+        Path(f"{self.filename}.svg").write_bytes(self.dot.pipe(format="svg", quiet=True))
+        diagrams.setdiagram(None)
+
+    __exit__._direct_svg = True
+    diagrams.Diagram.__exit__ = __exit__
+
+
+def _run_request(code):
+    """Execute one code blob, returning (status, error output)."""
+    import contextlib
+    import io
+    import traceback
+
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            exec(compile(code, '<diagram>', 'exec'), {'__name__': '__main__'})
+        status = 0
+    except SystemExit as e:
+        status = 0 if e.code in (None, 0) else 1
+        if status:
+            output.write(f"SystemExit: {e.code}\n")
+    except BaseException:
+        status = 1
+        output.write(traceback.format_exc())
+    # Like the one-shot path, printed output is only reported on failure
+    return status, output.getvalue() if status else ""
+
+
+def _worker_main():
+    """
+    Worker loop run inside the pooled subprocess (POSIX only).
+
+    Reads length-prefixed (working directory, code) pairs from stdin and runs
+    each in a forked child, so every request starts from the same pre-imported
+    state and nothing a snippet does (e.g. patching a module) carries over to
+    the next. The child changes to the caller's working directory, runs the
+    code and writes back a status byte plus captured output. Code must
+    already have passed validate_code in the parent process.
+    """
+    import struct
+
+    # Keep the protocol stream private; stray writes to fd 1 go to stderr
+    channel = os.fdopen(os.dup(1), 'wb')
+    os.dup2(2, 1)
+
+    for module in WORKER_PRELOAD:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    _install_direct_svg_render()
+
+    def reply(status, text):
+        payload = text.encode('utf-8')
+        channel.write(struct.pack('>BI', status, len(payload)) + payload)
+        channel.flush()
+
+    requests = sys.stdin.buffer
+    while True:
+        header = requests.read(8)
+        if len(header) < 8:
+            break
+        cwd_size, code_size = struct.unpack('>II', header)
+        cwd = os.fsdecode(requests.read(cwd_size))
+        code = requests.read(code_size).decode('utf-8')
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                try:
+                    os.chdir(cwd)
+                except OSError as e:
+                    reply(1, f"Cannot enter working directory: {e}\n")
+                else:
+                    reply(*_run_request(code))
+            finally:
+                os._exit(0)
+
+        _, wait_status = os.waitpid(pid, 0)
+        if wait_status != 0:
+            # The child died before it could answer
+            reply(1, f"Diagram process exited abnormally (wait status {wait_status})\n")
+
+
+class _WorkerPool:
+    """
+    Persistent worker process with the diagram libraries pre-imported.
+
+    Amortizes interpreter startup and library imports across generations;
+    each request still runs in its own forked child. Requests are serialized
+    with a lock. A worker that times out is killed together with its children
+    and respawned on the next request.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        """Return the process-wide worker pool, creating it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = None
+        self._responses = None
+
+    def _spawn(self):
+        import queue
+
+        bootstrap = (
+            f"import sys; sys.path.insert(0, {str(Path(__file__).resolve().parent)!r}); "
+            "import generate_diagram; generate_diagram._worker_main()"
+        )
+        # Own session, so a timeout can kill the forked children too
+        self._process = subprocess.Popen(
+            [sys.executable, '-u', '-c', bootstrap],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=_CHILD_ENV,
+            start_new_session=True
+        )
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process.stdout, self._responses),
+            daemon=True
+        ).start()
+
+    @staticmethod
+    def _read_responses(stream, responses):
+        """Forward (status, output) replies to the queue; None on EOF."""
+        import struct
+
+        while True:
+            header = stream.read(5)
+            if len(header) < 5:
+                responses.put(None)
+                return
+            status, size = struct.unpack('>BI', header)
+            responses.put((status, stream.read(size).decode('utf-8', errors='replace')))
+
+    def run(self, code, timeout):
+        """
+        Execute code in the worker.
+
+        Returns:
+            tuple: (success, error), or None if the worker died
+
+        Raises:
+            subprocess.TimeoutExpired: if the worker did not answer in time
+        """
+        import queue
+        import struct
+
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._spawn()
+
+            # Run in the caller's current directory, like a fresh subprocess
+            cwd = os.fsencode(os.getcwd())
+            blob = code.encode('utf-8')
+            try:
+                self._process.stdin.write(
+                    struct.pack('>II', len(cwd), len(blob)) + cwd + blob
+                )
+                self._process.stdin.flush()
+            except OSError:
+                self._close(kill=True)
+                return None
+
+            try:
+                response = self._responses.get(timeout=timeout)
+            except queue.Empty:
+                self._close(kill=True)
+                raise subprocess.TimeoutExpired('diagram worker', timeout)
+
+            if response is None:
+                self._close(kill=True)
+                return None
+            status, output = response
+            return status == 0, output
+
+    def close(self, kill=False):
+        """Stop the worker, killing it if asked or if it does not exit."""
+        with self._lock:
+            self._close(kill)
+
+    def _close(self, kill):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if not kill:
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+                return
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            process.kill()
+        process.wait()
+
+
+def _execute_in_subprocess(code, timeout):
+    """Execute code in a one-shot subprocess (platforms without fork)."""
+    import tempfile
 
     # Write code to temporary file
     with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
@@ -334,29 +663,21 @@ def execute_diagram_code(code, timeout=EXECUTION_TIMEOUT):
         temp_path = f.name
 
     try:
-        # Execute in subprocess with minimal environment
-        env = {
-            'PATH': subprocess.os.environ.get('PATH', ''),
-            'PYTHONPATH': subprocess.os.environ.get('PYTHONPATH', ''),
-            'HOME': subprocess.os.environ.get('HOME', ''),
-            'TEMP': subprocess.os.environ.get('TEMP', ''),
-            'TMP': subprocess.os.environ.get('TMP', ''),
-            'USERPROFILE': subprocess.os.environ.get('USERPROFILE', ''),
-        }
-
         result = subprocess.run(
             [sys.executable, temp_path],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=timeout,
-            env=env,
+            env=_CHILD_ENV,
             cwd=Path.cwd()
         )
 
+        # Diagram scripts print nothing useful; only decode stderr on failure
         if result.returncode == 0:
-            return True, result.stdout
+            return True, ""
         else:
-            return False, f"Execution error:\n{result.stderr}"
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            return False, f"Execution error:\n{stderr}"
 
     except subprocess.TimeoutExpired:
         return False, f"Execution timed out after {timeout} seconds"
@@ -370,375 +691,236 @@ def execute_diagram_code(code, timeout=EXECUTION_TIMEOUT):
             pass
 
 
+def _safe_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """__import__ replacement that only admits whitelisted modules."""
+    if level != 0 or not CodeValidator._is_allowed_import(name):
+        raise ImportError(f"Blocked import: '{name}'")
+    return __import__(name, globals, locals, fromlist, level)
+
+
+# Globals for in-process template execution (copied per run)
+_SAFE_GLOBALS = {
+    "__builtins__": {
+        **{name: getattr(builtins, name) for name in SAFE_BUILTINS},
+        "__import__": _safe_import,
+    },
+}
+
+# In-process execution relies on SIGALRM for the timeout, which is POSIX-only
+# and can only be delivered to the main thread
+_HAS_ALARM = hasattr(signal, "setitimer")
+
+
+class _ExecutionTimeout(Exception):
+    """Raised by the SIGALRM handler when in-process execution overruns."""
+    pass
+
+
+def _execute_in_process(code, variables, timeout):
+    """Execute a validated code object in this process with restricted globals."""
+    import traceback
+
+    def on_alarm(signum, frame):
+        raise _ExecutionTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        namespace = {"__builtins__": dict(_SAFE_GLOBALS["__builtins__"]), **variables}
+        exec(code, namespace)
+        return True, ""
+    except _ExecutionTimeout:
+        return False, f"Execution timed out after {timeout} seconds"
+    except Exception:
+        return False, f"Execution error:\n{traceback.format_exc()}"
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def execute_template_code(code, variables, timeout=EXECUTION_TIMEOUT, compiled=None):
+    """
+    Execute pattern template code with the given values as globals.
+
+    Templates are authored in this repository and only vary by the sanitized
+    name and output, so after validation they run in-process instead of
+    paying for a Python subprocess. Platforms without SIGALRM, calls from
+    non-main threads and hosts with their own ITIMER_REAL running (which the
+    timeout would clobber) fall back to execute_diagram_code with the values
+    assigned at the top of the script.
+
+    Args:
+        code: Template source
+        variables: Globals the template reads (e.g. NAME, OUTPUT)
+        timeout: Maximum execution time in seconds
+        compiled: Code object for code that has already passed validation;
+            skips validating and compiling again
+
+    Returns:
+        tuple: (success, error), where error is "" on success
+    """
+    if (not _HAS_ALARM
+            or threading.current_thread() is not threading.main_thread()
+            or signal.getitimer(signal.ITIMER_REAL)[0]):
+        prelude = "".join(f"{key} = {value!r}\n" for key, value in variables.items())
+        return execute_diagram_code(prelude + code, timeout)
+
+    if compiled is None:
+        is_valid, errors = validate_code(code)
+        if not is_valid:
+            return False, f"Code validation failed:\n" + "\n".join(f"  - {e}" for e in errors)
+        compiled = compile(code, '<template>', 'exec')
+
+    _install_direct_svg_render()
+    return _execute_in_process(compiled, variables, timeout)
+
+
+def execute_diagram_code(code, timeout=EXECUTION_TIMEOUT):
+    """
+    Execute validated diagram code in an isolated subprocess.
+
+    On POSIX, code runs in a child forked from a persistent worker that has
+    the diagram libraries pre-imported (see _WorkerPool), so no state is
+    shared between runs. Elsewhere it runs in a one-shot subprocess.
+
+    Args:
+        code: Validated Python code to execute
+        timeout: Maximum execution time in seconds
+
+    Returns:
+        tuple: (success, error), where error is "" on success
+    """
+    # First validate the code
+    is_valid, errors = validate_code(code)
+    if not is_valid:
+        return False, f"Code validation failed:\n" + "\n".join(f"  - {e}" for e in errors)
+
+    if not _HAS_FORK:
+        return _execute_in_subprocess(code, timeout)
+
+    try:
+        result = _WorkerPool.get().run(code, timeout)
+    except subprocess.TimeoutExpired:
+        return False, f"Execution timed out after {timeout} seconds"
+    except Exception as e:
+        return False, f"Execution failed: {str(e)}"
+
+    # Not retried: the code may already have had side effects
+    if result is None:
+        return False, "Execution failed: diagram worker exited unexpectedly"
+
+    success, output = result
+    if success:
+        return True, output
+    else:
+        return False, f"Execution error:\n{output}"
+
+
 # =============================================================================
 # PATTERN TEMPLATES
 # =============================================================================
 
-# Pattern templates - easily extensible
-PATTERNS = {
-    "api-led": {
-        "description": "API-Led Connectivity (3-tier: Experience, Process, System)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import APIManagement, LogicApps, ServiceBus
-from diagrams.azure.compute import FunctionApps
-from diagrams.azure.database import CosmosDb, SQL
-from diagrams.azure.storage import BlobStorage
-from diagrams.azure.security import KeyVaults
-from diagrams.onprem.client import Users
-
-with Diagram("{name}", show=False, filename="{output}", direction="LR", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-    users = Users("API Consumers")
-
-    with Cluster("Experience Layer"):
-        apim = APIManagement("API Management")
-
-    with Cluster("Process Layer"):
-        logic = LogicApps("Orchestration")
-        func = FunctionApps("Transformation")
-
-    with Cluster("System Layer"):
-        bus = ServiceBus("Service Bus")
-
-    with Cluster("Data Layer"):
-        cosmos = CosmosDb("Cosmos DB")
-        sql = SQL("Azure SQL")
-        blob = BlobStorage("Blob Storage")
-
-    kv = KeyVaults("Key Vault")
-
-    users >> apim >> logic >> bus >> func
-    func >> [cosmos, sql, blob]
-    logic >> Edge(style="dashed") >> kv
-'''
-    },
+# Pattern templates - easily extensible (descriptions in _pattern_meta.py,
+# template bodies in _pattern_templates.py)
+class _LazyPatterns(Mapping):
+    """
+    Read-only pattern registry that loads template bodies on first access.
 
-    "hybrid": {
-        "description": "Hybrid Integration (On-premises to Azure)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import LogicApps, ServiceBus, DataFactories
-from diagrams.azure.networking import OnPremisesDataGateways
-from diagrams.azure.storage import DataLakeStorage, BlobStorage
-from diagrams.azure.database import CosmosDb
-from diagrams.azure.security import KeyVaults
-from diagrams.onprem.database import MSSQL
-from diagrams.onprem.compute import Server
-
-with Diagram("{name}", show=False, filename="{output}", direction="LR", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    with Cluster("On-Premises"):
-        erp = Server("ERP System")
-        sql = MSSQL("SQL Server")
-        files = Server("File Server")
-
-    gateway = OnPremisesDataGateways("Data Gateway")
-
-    with Cluster("Azure Integration"):
-        logic = LogicApps("Logic Apps")
-        adf = DataFactories("Data Factory")
-        bus = ServiceBus("Service Bus")
-
-    with Cluster("Azure Data"):
-        cosmos = CosmosDb("Cosmos DB")
-        lake = DataLakeStorage("Data Lake")
-        blob = BlobStorage("Blob Storage")
-
-    kv = KeyVaults("Key Vault")
-
-    [erp, sql] >> gateway >> logic >> bus
-    files >> gateway >> adf >> lake
-    logic >> cosmos
-    adf >> blob
-    logic >> Edge(style="dashed") >> kv
-'''
-    },
+    Iteration, membership and len() only touch the description metadata, so
+    --list and pattern selection never import the templates module. Each
+    template is validated and compiled once, on first access.
+    """
 
-    "event-driven": {
-        "description": "Event-Driven Architecture (Pub/Sub with multiple handlers)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import ServiceBus, EventGridTopics, LogicApps
-from diagrams.azure.compute import FunctionApps, AppServices
-from diagrams.azure.database import CosmosDb
-from diagrams.azure.storage import BlobStorage
-from diagrams.azure.monitor import ApplicationInsights
-
-with Diagram("{name}", show=False, filename="{output}", direction="TB", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    with Cluster("Event Producers"):
-        app1 = AppServices("Order Service")
-        app2 = AppServices("Inventory Service")
-
-    with Cluster("Event Routing"):
-        bus = ServiceBus("Service Bus Topics")
-        grid = EventGridTopics("Event Grid")
-
-    with Cluster("Event Handlers"):
-        func1 = FunctionApps("Notifier")
-        func2 = FunctionApps("Analytics")
-        logic = LogicApps("Fulfillment")
-        func3 = FunctionApps("Audit")
-
-    with Cluster("Data"):
-        cosmos = CosmosDb("Event Store")
-        blob = BlobStorage("Archive")
-
-    insights = ApplicationInsights("Monitoring")
-
-    [app1, app2] >> bus >> [func1, func2, logic]
-    app1 >> grid >> func3
-    [func1, logic] >> cosmos
-    func3 >> blob
-    func2 >> Edge(style="dotted") >> insights
-'''
-    },
+    def __init__(self, descriptions):
+        self._descriptions = descriptions
+        self._entries = {}
 
-    "microservices": {
-        "description": "Microservices with Service Bus (Domain-driven design)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import APIManagement, ServiceBus
-from diagrams.azure.compute import ContainerApps, FunctionApps
-from diagrams.azure.database import CosmosDb, SQL, CacheForRedis
-from diagrams.azure.monitor import ApplicationInsights
-
-with Diagram("{name}", show=False, filename="{output}", direction="TB", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    apim = APIManagement("API Gateway")
-
-    with Cluster("Microservices"):
-        with Cluster("Order Domain"):
-            order_svc = ContainerApps("Order Service")
-            order_db = CosmosDb("Orders")
-
-        with Cluster("Product Domain"):
-            product_svc = ContainerApps("Product Service")
-            product_db = SQL("Products")
-
-        with Cluster("Notification Domain"):
-            notif_svc = FunctionApps("Notification Service")
-
-    bus = ServiceBus("Event Bus")
-    cache = CacheForRedis("Cache")
-    insights = ApplicationInsights("App Insights")
-
-    apim >> [order_svc, product_svc]
-    order_svc >> order_db
-    product_svc >> product_db
-    order_svc >> bus >> [product_svc, notif_svc]
-    [order_svc, product_svc] >> cache
-    [order_svc, product_svc, notif_svc] >> Edge(style="dotted") >> insights
-'''
-    },
+    def __getitem__(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            from _pattern_templates import TEMPLATES
+            template = TEMPLATES[key]
 
-    "b2b-edi": {
-        "description": "B2B/EDI Integration (Trading partners with Integration Accounts)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import APIManagement, LogicApps, IntegrationAccounts, ServiceBus
-from diagrams.azure.storage import BlobStorage
-from diagrams.azure.security import KeyVaults
-from diagrams.onprem.client import Client
-from diagrams.onprem.compute import Server
-
-with Diagram("{name}", show=False, filename="{output}", direction="LR", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    with Cluster("Trading Partners"):
-        partner1 = Client("Supplier A")
-        partner2 = Client("Supplier B")
-        partner3 = Client("Customer")
-
-    apim = APIManagement("AS2/SFTP Gateway")
-
-    with Cluster("B2B Processing"):
-        ia = IntegrationAccounts("Integration Account\\n(Maps, Schemas, Certs)")
-        logic = LogicApps("EDI Processing")
-        bus = ServiceBus("Message Queue")
-
-    with Cluster("Backend"):
-        erp = Server("ERP System")
-        archive = BlobStorage("EDI Archive")
-
-    kv = KeyVaults("Certificates & Keys")
-
-    [partner1, partner2, partner3] >> apim >> logic
-    logic - Edge(style="dashed") - ia
-    logic >> bus >> erp
-    logic >> archive
-    ia >> Edge(style="dashed") >> kv
-'''
-    },
+            # Templates are fixed source, so validate and compile them once
+            is_valid, errors = validate_code(template)
+            if not is_valid:
+                raise CodeValidationError(f"Pattern '{key}' failed validation: {errors}")
 
-    "data-pipeline": {
-        "description": "Data Pipeline (ETL/ELT with Data Factory and Synapse)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import DataFactories
-from diagrams.azure.analytics import AzureDatabricks, AzureSynapseAnalytics
-from diagrams.azure.storage import DataLakeStorage, BlobStorage
-from diagrams.azure.database import SQL
-from diagrams.onprem.database import MSSQL, Oracle
-
-with Diagram("{name}", show=False, filename="{output}", direction="LR", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    with Cluster("Data Sources"):
-        sql_src = MSSQL("On-Prem SQL")
-        oracle = Oracle("Oracle")
-        blob_src = BlobStorage("File Drops")
-
-    with Cluster("Ingestion"):
-        adf = DataFactories("Data Factory")
-
-    with Cluster("Data Lake"):
-        raw = DataLakeStorage("Raw Zone")
-        curated = DataLakeStorage("Curated Zone")
-
-    with Cluster("Transform"):
-        databricks = AzureDatabricks("Databricks")
-
-    with Cluster("Serve"):
-        synapse = AzureSynapseAnalytics("Synapse Analytics")
-        sql_dw = SQL("Azure SQL DW")
-
-    [sql_src, oracle, blob_src] >> adf >> raw
-    raw >> databricks >> curated
-    curated >> [synapse, sql_dw]
-'''
-    },
+            entry = MappingProxyType({
+                "description": self._descriptions[key],
+                "template": template,
+                "code": compile(template, f"<{key}>", "exec"),
+            })
+            self._entries[key] = entry
+        return entry
 
-    "secure-private": {
-        "description": "Secure Architecture (Private Endpoints and VNet Integration)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import APIManagement, LogicApps, ServiceBus
-from diagrams.azure.compute import FunctionApps
-from diagrams.azure.networking import ApplicationGateways, VirtualNetworks
-from diagrams.azure.database import SQL, CosmosDb
-from diagrams.azure.storage import BlobStorage
-from diagrams.azure.security import KeyVaults
-from diagrams.onprem.client import Users
-
-with Diagram("{name}", show=False, filename="{output}", direction="TB", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    users = Users("Users")
-    appgw = ApplicationGateways("App Gateway + WAF")
-
-    with Cluster("Virtual Network"):
-        with Cluster("Integration Subnet"):
-            apim = APIManagement("APIM (Internal)")
-            logic = LogicApps("Logic Apps")
-            func = FunctionApps("Functions")
-
-        with Cluster("Data Subnet (Private Endpoints)"):
-            sql = SQL("Azure SQL")
-            cosmos = CosmosDb("Cosmos DB")
-            blob = BlobStorage("Storage")
-            bus = ServiceBus("Service Bus")
-            kv = KeyVaults("Key Vault")
-
-    users >> appgw >> apim >> [logic, func]
-    logic >> bus
-    logic >> [sql, cosmos, blob]
-    func >> [sql, cosmos]
-    logic >> Edge(style="dashed") >> kv
-    func >> Edge(style="dashed") >> kv
-'''
-    },
+    def __iter__(self):
+        return iter(self._descriptions)
 
-    "multi-region": {
-        "description": "Multi-Region HA (Geo-redundant with Front Door)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.integration import APIManagement, LogicApps, ServiceBus
-from diagrams.azure.networking import FrontDoorAndCDNProfiles
-from diagrams.azure.database import CosmosDb, SQL
-
-with Diagram("{name}", show=False, filename="{output}", direction="TB", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    frontdoor = FrontDoorAndCDNProfiles("Azure Front Door")
-
-    with Cluster("UK South (Primary)"):
-        apim1 = APIManagement("APIM")
-        logic1 = LogicApps("Logic Apps")
-        bus1 = ServiceBus("Service Bus")
-        sql1 = SQL("SQL Primary")
-
-    with Cluster("UK West (DR)"):
-        apim2 = APIManagement("APIM")
-        logic2 = LogicApps("Logic Apps")
-        bus2 = ServiceBus("Service Bus")
-        sql2 = SQL("SQL Secondary")
-
-    cosmos = CosmosDb("Cosmos DB\\n(Multi-Region)")
-
-    frontdoor >> [apim1, apim2]
-    apim1 >> logic1 >> bus1
-    apim2 >> logic2 >> bus2
-    logic1 >> cosmos
-    logic2 >> cosmos
-    sql1 - Edge(style="dashed", label="Geo-Rep") - sql2
-'''
-    },
+    def __len__(self):
+        return len(self._descriptions)
 
-    "iot-streaming": {
-        "description": "IoT & Streaming (Real-time data ingestion and processing)",
-        "template": '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.azure.iot import IotHub, IotEdge
-from diagrams.azure.analytics import EventHubs, StreamAnalyticsJobs
-from diagrams.azure.compute import FunctionApps
-from diagrams.azure.database import CosmosDb
-from diagrams.azure.storage import DataLakeStorage
-from diagrams.azure.ml import MachineLearningServiceWorkspaces
-
-with Diagram("{name}", show=False, filename="{output}", direction="LR", outformat="svg",
-             graph_attr={{"fontsize": "20", "bgcolor": "white", "pad": "0.5"}}):
-
-    with Cluster("Edge"):
-        edge = IotEdge("IoT Edge")
-
-    with Cluster("Ingestion"):
-        iot = IotHub("IoT Hub")
-        eh = EventHubs("Event Hubs")
-
-    with Cluster("Processing"):
-        asa = StreamAnalyticsJobs("Stream Analytics")
-        func = FunctionApps("Alerting")
-
-    with Cluster("Storage"):
-        cosmos = CosmosDb("Hot Store")
-        lake = DataLakeStorage("Cold Store")
-
-    ml = MachineLearningServiceWorkspaces("ML Workspace")
-
-    edge >> iot >> asa
-    asa >> [cosmos, lake, func]
-    eh >> asa
-    lake >> ml
-'''
-    },
-}
+    def __contains__(self, key):
+        return key in self._descriptions
+
+
+PATTERNS = _LazyPatterns(DESCRIPTIONS)
+
+
+# =============================================================================
+# SVG CACHE
+# =============================================================================
+
+def _cache_lookup(key, destination):
+    """Copy a cached SVG to destination. Returns True on a cache hit."""
+    import shutil
+
+    cached = SVG_CACHE_DIR / f"{key}.svg"
+    try:
+        shutil.copyfile(cached, destination)
+        # Refresh the entry's position for LRU eviction
+        os.utime(cached)
+        return True
+    except OSError:
+        return False
+
+
+def _cache_store(key, source):
+    """Store a generated SVG in the cache, evicting least recently used entries."""
+    import shutil
+
+    try:
+        SVG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Copy then rename so concurrent readers never see a partial file
+        staging = SVG_CACHE_DIR / f"{key}.{os.getpid()}.tmp"
+        shutil.copyfile(source, staging)
+        os.replace(staging, SVG_CACHE_DIR / f"{key}.svg")
+
+        entries = sorted(SVG_CACHE_DIR.glob("*.svg"),
+                         key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[SVG_CACHE_SIZE:]:
+            stale.unlink()
+    except OSError:
+        # The cache is an optimization only
+        pass
 
 
 # =============================================================================
 # DIAGRAM GENERATION
 # =============================================================================
 
-def generate_diagram(name: str, pattern: str, output: str):
-    """Generate a diagram from a pattern template."""
+def render_pattern(name: str, pattern: str, output: str, use_cache: bool = True):
+    """
+    Render a pattern template to <output>.svg.
+
+    Returns:
+        tuple: (success, message)
+    """
+    import hashlib
+
     if pattern not in PATTERNS:
-        print(f"Error: Unknown pattern '{pattern}'")
-        print(f"Available patterns: {', '.join(PATTERNS.keys())}")
-        sys.exit(1)
+        return False, (f"Error: Unknown pattern '{pattern}'\n"
+                       f"Available patterns: {', '.join(PATTERNS.keys())}")
 
     # Sanitize inputs
     safe_name = sanitize_name(name)
@@ -747,19 +929,70 @@ def generate_diagram(name: str, pattern: str, output: str):
     # Validate output path
     is_valid, error = validate_output_path(safe_output)
     if not is_valid:
-        print(f"Error: {error}")
+        return False, f"Error: {error}"
+
+    entry = PATTERNS[pattern]
+    svg_path = f"{safe_output}.svg"
+
+    # Identical inputs render identical SVGs, so skip layout on a cache hit.
+    # sys.prefix keys on the environment, since diagrams/graphviz versions
+    # (and so the output) can differ between virtualenvs.
+    cache_input = "\0".join((SVG_CACHE_VERSION, sys.prefix, entry["template"],
+                              repr(_GRAPH_ATTR), safe_name, safe_output))
+    cache_key = hashlib.sha256(cache_input.encode()).hexdigest()
+    if use_cache and _cache_lookup(cache_key, svg_path):
+        return True, f"Generated: {svg_path} (cached)"
+
+    # The template was validated and compiled when loaded; name and output
+    # are passed as values, never spliced into the source
+    variables = {"NAME": safe_name, "OUTPUT": safe_output, "GRAPH_ATTR": _GRAPH_ATTR}
+    success, result = execute_template_code(entry["template"], variables,
+                                            compiled=entry["code"])
+
+    if success:
+        if use_cache:
+            _cache_store(cache_key, svg_path)
+        return True, f"Generated: {svg_path}"
+    else:
+        return False, f"Error generating diagram:\n{result}"
+
+
+def generate_diagram(name: str, pattern: str, output: str, use_cache: bool = True):
+    """Generate a diagram from a pattern template."""
+    success, message = render_pattern(name, pattern, output, use_cache)
+    print(message)
+    if not success:
         sys.exit(1)
 
-    template = PATTERNS[pattern]["template"]
-    code = template.format(name=safe_name, output=safe_output)
 
-    # Execute with security validation
-    success, result = execute_diagram_code(code)
+def _render_one(pattern: str, use_cache: bool = True):
+    """Render one pattern with default name/output (runs in a pool process)."""
+    return render_pattern(pattern.title(), pattern, f"arch-{pattern}", use_cache)
 
-    if success:
-        print(f"Generated: {safe_output}.svg")
-    else:
-        print(f"Error generating diagram:\n{result}")
+
+def generate_all(use_cache: bool = True):
+    """
+    Generate every pattern as arch-<pattern>.svg, in parallel.
+
+    Layout is CPU-bound and the diagrams are independent, so each pattern
+    renders in its own pool process. Pool processes keep diagrams imported
+    between jobs.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    patterns = list(PATTERNS)
+    workers = min(os.cpu_count() or 1, len(patterns))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_render_one, patterns, [use_cache] * len(patterns)))
+
+    failed = 0
+    for success, message in results:
+        print(message)
+        if not success:
+            failed += 1
+
+    if failed:
+        print(f"\n{failed} of {len(patterns)} patterns failed")
         sys.exit(1)
 
 
@@ -770,8 +1003,8 @@ def interactive_mode():
 
     # Show available patterns
     print("\nAvailable patterns:")
-    for i, (key, val) in enumerate(PATTERNS.items(), 1):
-        print(f"  {i}. {key}: {val['description']}")
+    for i, (key, description) in enumerate(DESCRIPTIONS.items(), 1):
+        print(f"  {i}. {key}: {description}")
 
     # Get pattern selection
     print()
@@ -786,7 +1019,7 @@ def interactive_mode():
             print("Invalid selection")
             sys.exit(1)
     else:
-        pattern = choice.lower().replace(" ", "-")
+        pattern = sys.intern(choice.lower().replace(" ", "-"))
 
     if pattern not in PATTERNS:
         print(f"Unknown pattern: {pattern}")
@@ -803,7 +1036,7 @@ def interactive_mode():
         output = "architecture"
 
     # Remove extension if provided
-    output = output.replace(".svg", "").replace(".png", "")
+    output = _EXT_RE.sub("", output)
 
     print(f"\nGenerating {pattern} diagram: '{name}'...")
     generate_diagram(name, pattern, output)
@@ -813,9 +1046,9 @@ def list_patterns():
     """List all available patterns."""
     print("\n Available Architecture Patterns")
     print("=" * 50)
-    for key, val in PATTERNS.items():
+    for key, description in DESCRIPTIONS.items():
         print(f"\n  {key}")
-        print(f"    {val['description']}")
+        print(f"    {description}")
     print()
 
 
@@ -829,6 +1062,7 @@ Examples:
   %(prog)s --list
   %(prog)s --name "Customer Portal" --pattern api-led --output customer-portal
   %(prog)s -n "Data Platform" -p data-pipeline -o data-arch
+  %(prog)s --all
         """
     )
 
@@ -836,12 +1070,16 @@ Examples:
                         help="Interactive mode")
     parser.add_argument("-l", "--list", action="store_true",
                         help="List available patterns")
+    parser.add_argument("-a", "--all", action="store_true",
+                        help="Generate every pattern in parallel as arch-<pattern>.svg")
     parser.add_argument("-n", "--name", type=str,
                         help="Diagram title")
     parser.add_argument("-p", "--pattern", type=str,
                         help="Pattern name (e.g., api-led, hybrid, event-driven)")
     parser.add_argument("-o", "--output", type=str, default="architecture",
                         help="Output filename (without extension)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-render instead of reusing a cached SVG")
 
     args = parser.parse_args()
 
@@ -849,8 +1087,11 @@ Examples:
         list_patterns()
     elif args.interactive:
         interactive_mode()
+    elif args.all:
+        generate_all(use_cache=not args.no_cache)
     elif args.name and args.pattern:
-        generate_diagram(args.name, args.pattern, args.output)
+        generate_diagram(args.name, args.pattern, args.output,
+                         use_cache=not args.no_cache)
     else:
         parser.print_help()
 
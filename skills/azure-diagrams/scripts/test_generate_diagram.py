@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the code validator in generate_diagram.py.
+
+Usage:
+    python -m unittest test_generate_diagram
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_diagram import CodeValidator, validate_code
+
+
+def errors_for(code):
+    return CodeValidator().validate(code)
+
+
+class CodeValidatorTest(unittest.TestCase):
+    """The validator must flag every blocked construct, wherever it appears."""
+
+    def test_allows_diagram_code(self):
+        code = (
+            "from diagrams import Diagram, Cluster\n"
+            "from diagrams.azure.compute import FunctionApps\n"
+            "with Diagram('x', show=False):\n"
+            "    FunctionApps('f')\n"
+        )
+        self.assertEqual(errors_for(code), [])
+
+    def test_blocked_name_call(self):
+        self.assertEqual(errors_for('exec("code")'), ["Blocked builtin call: 'exec()'"])
+        self.assertEqual(errors_for("x = [eval(s) for s in y]"),
+                         ["Blocked builtin call: 'eval()'"])
+
+    def test_blocked_attribute_call(self):
+        self.assertEqual(errors_for("obj.compile(src)"),
+                         ["Blocked builtin call: 'compile()'"])
+
+    def test_blocked_attribute_access(self):
+        self.assertEqual(errors_for("x = ().__class__"),
+                         ["Blocked attribute access: '__class__'"])
+        self.assertIn("Blocked attribute access: '__subclasses__'",
+                      errors_for("().__class__.__bases__[0].__subclasses__()"))
+
+    def test_calls_in_lambda_and_defaults(self):
+        self.assertEqual(errors_for("f = lambda: open('x')"),
+                         ["Blocked builtin call: 'open()'"])
+        self.assertEqual(errors_for("def f(x=getattr(a, 'b')):\n    pass"),
+                         ["Blocked builtin call: 'getattr()'"])
+
+    def test_blocked_imports(self):
+        self.assertEqual(errors_for("import os"), ["Blocked import: 'os'"])
+        self.assertEqual(errors_for("from subprocess import run"),
+                         ["Blocked import: 'subprocess'"])
+        self.assertEqual(errors_for("import os.path"), ["Blocked import: 'os.path'"])
+        self.assertEqual(errors_for("import pty"), ["Blocked import: 'pty'"])
+
+    def test_dotted_imports(self):
+        self.assertEqual(errors_for("import diagrams.azure.compute"), [])
+        self.assertEqual(errors_for("import diagramsx"), ["Blocked import: 'diagramsx'"])
+
+    def test_errors_in_source_order(self):
+        code = "import os\nimport sys\neval('1')\nx.__class__\n"
+        self.assertEqual(errors_for(code), [
+            "Blocked import: 'os'",
+            "Blocked import: 'sys'",
+            "Blocked builtin call: 'eval()'",
+            "Blocked attribute access: '__class__'",
+        ])
+
+    def test_normalized_identifiers(self):
+        # Python NFKC-normalizes identifiers, so fullwidth spellings are blocked too
+        self.assertEqual(errors_for("ｅｘｅｃ('1')"), ["Blocked builtin call: 'exec()'"])
+
+    def test_syntax_error(self):
+        is_valid, errors = validate_code("x = (1")
+        self.assertFalse(is_valid)
+        self.assertTrue(errors[0].startswith("Syntax error:"))
+
+    def test_validate_code_cache_returns_copies(self):
+        first = validate_code("import os")[1]
+        first.append("mutated")
+        self.assertEqual(validate_code("import os"), (False, ["Blocked import: 'os'"]))
+
+
+if __name__ == "__main__":
+    unittest.main()